@@ -1,4 +1,22 @@
 from .chan import Channel, chanselect
+from .coalesce import CoalescingChannel
+from .group import ChannelGroup
+from .ratelimit import RateLimitedChannel
+from .rpc import Envelope, Service
+from .timer import after, ticker
 from .errors import ChannelError, ChannelClosed, ChannelFull
 
-__all__ = ["Channel", "chanselect", "ChannelError", "ChannelClosed", "ChannelFull"]
+__all__ = [
+    "Channel",
+    "CoalescingChannel",
+    "ChannelGroup",
+    "RateLimitedChannel",
+    "Service",
+    "Envelope",
+    "chanselect",
+    "after",
+    "ticker",
+    "ChannelError",
+    "ChannelClosed",
+    "ChannelFull",
+]
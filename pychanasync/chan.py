@@ -1,16 +1,111 @@
 import asyncio
 import collections
 from asyncio import Future
-from typing import Any, Coroutine
+from typing import Any, Callable, Coroutine
 
 from pychanasync.errors import ChannelError, ChannelClosed, ChannelFull, ChannelEmpty
 
 
 class ProducerComponent:
-    def __init__(self, producer: Future[Any], value: Any):
+    # `producer` is None for a value put back into the channel, nobody is waiting on it
+    def __init__(self, producer: Future[Any] | None, value: Any):
         self.producer = producer
         self.value = value
 
+    def wake(self) -> bool:
+        """Lets the producer return, False if it has given up and its value must be skipped."""
+        if self.producer is None:
+            return True
+        if self.producer.cancelled():
+            return False
+        self.producer.set_result(None)
+        return True
+
+    def fail(self, exc: BaseException) -> None:
+        if self.producer is not None and not self.producer.done():
+            self.producer.set_exception(exc)
+
+
+class AdaptiveBound:
+    """
+    Bookkeeping for a channel whose bound adapts to the observed producer/consumer rates.
+
+    Statistics are collected over windows of `WINDOW` pulls. At the end of each window the bound is doubled
+    when producers were blocked often, and halved when the buffer occupancy stayed low. When a target latency
+    is given, the queueing delay of every item is measured from its enqueue time. Whenever the mean delay exceeds
+    the target the bound is halved and capped to what consumers drain within the target (Little's law), the drain
+    rate being measured over the time the buffer was not empty so that idle periods between bursts do not count.
+    Times are taken from the event loop clock.
+    """
+
+    WINDOW = 32
+
+    def __init__(self, min_bound: int, max_bound: int, target_latency: float | None):
+        self.min_bound = min_bound
+        self.max_bound = max_bound
+        self.target_latency = target_latency
+        # only timestamp items when a latency target needs them
+        self.enqueue_times: collections.deque[float] | None = (
+            collections.deque() if target_latency is not None else None
+        )
+        # when the buffer last became non-empty, None while it is empty
+        self.busy_since: float | None = None
+        self._reset()
+
+    def _reset(self) -> None:
+        self.pulls = 0
+        self.blocked = 0
+        self.peak = 0
+        self.delay = 0.0
+        self.busy = 0.0
+
+    def enqueued(self, size: int, front: bool = False) -> None:
+        if self.enqueue_times is not None:
+            now = asyncio.get_running_loop().time()
+            if front:
+                self.enqueue_times.appendleft(now)
+            else:
+                self.enqueue_times.append(now)
+            if self.busy_since is None:
+                self.busy_since = now
+        if size > self.peak:
+            self.peak = size
+
+    def dequeued(self, bound: int, size: int) -> int | None:
+        """Records a pull, returns the new bound at the end of a window if it should change."""
+        now = 0.0
+        if self.enqueue_times is not None:
+            now = asyncio.get_running_loop().time()
+            self.delay += now - self.enqueue_times.popleft()
+            if size == 0 and self.busy_since is not None:
+                self.busy += now - self.busy_since
+                self.busy_since = None
+        self.pulls += 1
+        if self.pulls < self.WINDOW:
+            return None
+
+        if self.busy_since is not None:
+            # still busy, count the window up to now
+            self.busy += now - self.busy_since
+            self.busy_since = now
+
+        new_bound = bound
+        if self.blocked * 4 > self.pulls:
+            new_bound = bound * 2
+        elif self.peak * 4 <= bound:
+            new_bound = bound // 2
+
+        if self.target_latency is not None and self.delay / self.pulls > self.target_latency:
+            new_bound = min(new_bound, bound // 2)
+            if self.busy > 0:
+                # items drained within the target at the rate observed while busy
+                new_bound = min(new_bound, max(1, int(self.pulls / self.busy * self.target_latency)))
+
+        self._reset()
+        # never shrink below what is already buffered, the deque would drop items
+        new_bound = max(self.min_bound, min(self.max_bound, new_bound), size)
+        return new_bound if new_bound != bound else None
+
 
 class Channel:
     """
@@ -26,14 +121,74 @@ class Channel:
                     When Channel is buffered. Producers will only  block when the internal buffer is full and
                     receivers will only block when the buffer is empty.
 
+    :param high_watermark:  Buffered channels only. When the number of items in the buffer rises to this
+                            value the channel is considered above its high watermark, `on_high_watermark`
+                            is called and `wait_high_watermark` waiters are woken up.
+
+    :param low_watermark:   Buffered channels only. Once above the high watermark, when the number of items
+                            in the buffer falls back to this value `on_low_watermark` is called and
+                            `wait_low_watermark` waiters are woken up. Defaults to half the high watermark.
+                            The gap between the two watermarks avoids oscillating around a single boundary.
+
+    :param on_high_watermark:   Synchronous callable with no arguments, e.g `transport.pause_reading`.
+
+    :param on_low_watermark:    Synchronous callable with no arguments, e.g `transport.resume_reading`.
+
+    :param min_bound:   Buffered channels only. Together with `max_bound` makes the bound adaptive, `bound` is then
+                        the initial size. The bound grows when producers block often and shrinks when the
+                        occupancy stays low, always within `min_bound` and `max_bound`. Defaults to 1.
+
+    :param max_bound:   Buffered channels only. Upper limit of an adaptive bound, setting it enables adaptive sizing.
+
+    :param target_latency:  Adaptive channels only. Queueing delay in seconds to keep items under,
+                            e.g 0.005 for 5 ms. The bound is shrunk whenever the measured delay exceeds it.
+
     """
 
-    def __init__(self, bound: int | None = None) -> None:
+    def __init__(
+        self,
+        bound: int | None = None,
+        high_watermark: int | None = None,
+        low_watermark: int | None = None,
+        on_high_watermark: Callable[[], Any] | None = None,
+        on_low_watermark: Callable[[], Any] | None = None,
+        min_bound: int | None = None,
+        max_bound: int | None = None,
+        target_latency: float | None = None,
+    ) -> None:
 
         # validate bound
         if bound is not None and bound < 0:
             raise ChannelError("Channel bound must be > 0")
 
+        # validate watermarks
+        if high_watermark is None and low_watermark is not None:
+            raise ChannelError("low_watermark requires a high_watermark")
+        if high_watermark is not None:
+            if not bound:
+                raise ChannelError("Watermarks are only allowed on buffered channels")
+            if low_watermark is None:
+                low_watermark = high_watermark // 2
+            if not 0 <= low_watermark < high_watermark <= bound:
+                raise ChannelError(
+                    "Channel watermarks must satisfy 0 <= low_watermark < high_watermark <= bound"
+                )
+
+        # validate adaptive bound
+        if max_bound is None and (min_bound is not None or target_latency is not None):
+            raise ChannelError("min_bound and target_latency require a max_bound")
+        if max_bound is not None:
+            if not bound:
+                raise ChannelError("Adaptive bounds are only allowed on buffered channels")
+            if high_watermark is not None:
+                raise ChannelError("Adaptive bounds cannot be combined with watermarks")
+            if min_bound is None:
+                min_bound = 1
+            if not 1 <= min_bound <= bound <= max_bound:
+                raise ChannelError("Channel bounds must satisfy 1 <= min_bound <= bound <= max_bound")
+            if target_latency is not None and target_latency <= 0:
+                raise ChannelError("Channel target_latency must be > 0")
+
         self._bound: int | None = bound
         if self._bound is not None:  # avoid buffer allocation entirely if not needed
             self.buffer: collections.deque[Any] = collections.deque(maxlen=bound)
@@ -44,6 +199,23 @@ class Channel:
             collections.deque()
         )
 
+        self._high_watermark: int | None = high_watermark
+        self._low_watermark: int | None = low_watermark
+        self._on_high_watermark = on_high_watermark
+        self._on_low_watermark = on_low_watermark
+        self._above_high_watermark: bool = False
+        if self._high_watermark is not None:  # avoid event allocation entirely if not needed
+            self._high_watermark_event: asyncio.Event = asyncio.Event()
+            self._low_watermark_event: asyncio.Event = asyncio.Event()
+            self._low_watermark_event.set()
+
+        self._drain_waiters: list[Future[Any]] | None = None
+        self._draining: bool = False
+
+        self._adaptive: AdaptiveBound | None = None
+        if max_bound is not None:
+            self._adaptive = AdaptiveBound(min_bound, max_bound, target_latency)  # pyright: ignore[reportArgumentType]
+
     def __repr__(self) -> str:
         return f"<Chan 0x{id(self):X}>"
 
@@ -63,37 +235,43 @@ class Channel:
 
         # check if channel is closed
 
-        if self._closed:
+        if self._closed or self._draining:
             raise ChannelClosed(which_chan=self)
 
         if self._bound is None:
             # unbuffered
-            if self._ready_receivers:
+            # skip receivers cancelled while waiting, handing them the value would lose it
+            while self._ready_receivers:
                 ready_receiver: Future[Any] = self._ready_receivers.popleft()
                 if not ready_receiver.cancelled():
                     ready_receiver.set_result(value)
-                return
+                    return
 
-            else:
-                ready_producer: Future[Any] = asyncio.Future()
-                new_producer = ProducerComponent(ready_producer, value)
-                self._ready_producers.append(new_producer)
-                return await ready_producer
+            ready_producer: Future[Any] = asyncio.Future()
+            new_producer = ProducerComponent(ready_producer, value)
+            self._ready_producers.append(new_producer)
+            return await ready_producer
 
         # buffered
         # if buffered channel and there are pending receivers
-        if self._ready_receivers:
+        while self._ready_receivers:
             ready_receiver_buff: Future[Any] = self._ready_receivers.popleft()
             if not ready_receiver_buff.cancelled():
                 ready_receiver_buff.set_result(value)
-            return
+                return
 
         # if there is space
         if len(self.buffer) < self._bound:  # pyright: ignore[reportOperatorIssue]
             self.buffer.append(value)
+            if self._high_watermark is not None:
+                self._check_watermarks()
+            if self._adaptive is not None:
+                self._adaptive.enqueued(len(self.buffer))
             return
 
         # if there is no space in the buffer producer will wait
+        if self._adaptive is not None:
+            self._adaptive.blocked += 1
         ready_producer_buffered: Future[Any] = asyncio.Future()
         new_producer = ProducerComponent(ready_producer_buffered, value)
         self._ready_producers.append(new_producer)
@@ -114,7 +292,7 @@ class Channel:
 
         # check if channel is closed
 
-        if self._closed:
+        if self._closed or self._draining:
             raise ChannelClosed(which_chan=self)
 
         if self._bound is None:
@@ -124,18 +302,24 @@ class Channel:
 
         # buffered
         # if buffered channel and there are pending receivers
-        if self._ready_receivers:
+        while self._ready_receivers:
             ready_receiver_buff: Future[Any] = self._ready_receivers.popleft()
             if not ready_receiver_buff.cancelled():
                 ready_receiver_buff.set_result(value)
-            return
+                return
 
         # if there is space
         if len(self.buffer) < self._bound:  # pyright: ignore[reportOperatorIssue]
             self.buffer.append(value)
+            if self._high_watermark is not None:
+                self._check_watermarks()
+            if self._adaptive is not None:
+                self._adaptive.enqueued(len(self.buffer))
             return
 
         # if there is no space in the buffer producer will wait
+        if self._adaptive is not None:
+            self._adaptive.blocked += 1
         raise ChannelFull(which_chan=self)
 
     async def pull(self) -> None | Any:
@@ -154,35 +338,51 @@ class Channel:
 
         # unbuffered
         if self._bound is None:
-            if self._ready_producers:
+            while self._ready_producers:
                 producer_component: ProducerComponent = self._ready_producers.popleft()
-                ready_producer: Future[Any] = producer_component.producer
-                if not ready_producer.cancelled():
-                    ready_producer.set_result(None)
+                if producer_component.wake():
+                    if self._drain_waiters is not None:
+                        self._notify_drained()
                     return producer_component.value
 
             ready_receiver: Future[Any] = asyncio.Future()
             self._ready_receivers.append(ready_receiver)
-            return await ready_receiver
+            try:
+                return await ready_receiver
+            except asyncio.CancelledError:
+                self._requeue_received(ready_receiver)
+                raise
 
         # buffered
         # if we have values in buffer
         if self.buffer:
             item = self.buffer.popleft()
-            if self._ready_producers:
+            # promote the first producer still waiting into the freed slot
+            while self._ready_producers:
                 producer_component_buff: ProducerComponent = (
                     self._ready_producers.popleft()
                 )
-                ready_producer_buff: Future[Any] = producer_component_buff.producer
-                if not ready_producer_buff.cancelled():
-                    ready_producer_buff.set_result(None)
+                if producer_component_buff.wake():
                     self.buffer.append(producer_component_buff.value)
+                    if self._adaptive is not None:
+                        self._adaptive.enqueued(len(self.buffer))
+                    break
+            if self._high_watermark is not None:
+                self._check_watermarks()
+            if self._adaptive is not None:
+                self._adapt()
+            if self._drain_waiters is not None:
+                self._notify_drained()
             return item
 
         # if buffered channel and buffer is empty then receiver will block
         ready_receiver_buff: Future[Any] = asyncio.Future()
         self._ready_receivers.append(ready_receiver_buff)
-        return await ready_receiver_buff
+        try:
+            return await ready_receiver_buff
+        except asyncio.CancelledError:
+            self._requeue_received(ready_receiver_buff)
+            raise
 
     def pull_nowait(self) -> None | Any:
         """
@@ -207,19 +407,69 @@ class Channel:
         # if we have values in buffer
         if self.buffer:
             item = self.buffer.popleft()
-            if self._ready_producers:
+            # promote the first producer still waiting into the freed slot
+            while self._ready_producers:
                 producer_component_buff: ProducerComponent = (
                     self._ready_producers.popleft()
                 )
-                ready_producer_buff: Future[Any] = producer_component_buff.producer
-                if not ready_producer_buff.cancelled():
-                    ready_producer_buff.set_result(None)
+                if producer_component_buff.wake():
                     self.buffer.append(producer_component_buff.value)
+                    if self._adaptive is not None:
+                        self._adaptive.enqueued(len(self.buffer))
+                    break
+            if self._high_watermark is not None:
+                self._check_watermarks()
+            if self._adaptive is not None:
+                self._adapt()
+            if self._drain_waiters is not None:
+                self._notify_drained()
             return item
 
         # if buffered channel and buffer is empty then we shall raise an exception
         raise ChannelEmpty(which_chan=self)
 
+    def _put_back_for(self, coro: Coroutine[None, None, Any]) -> Callable[[Any], None] | None:
+        # how `chanselect` gives back a value returned by `coro` once it lost, None if it is not a pull
+        if getattr(coro, "cr_code", None) is Channel.pull.__code__:
+            return self._requeue
+        return None
+
+    def _requeue_received(self, receiver: Future[Any]) -> None:
+        # the receiver was handed a value but its task got cancelled before it could resume
+        if receiver.done() and not receiver.cancelled() and receiver.exception() is None:
+            self._requeue(receiver.result())
+
+    def _requeue(self, value: Any) -> None:
+        # a pulled value nobody took goes back to the front of the channel,
+        # so it is neither lost nor overtaken by later items
+        if self._closed:
+            # nobody can pull any more, a buffered channel keeps it with its leftover items
+            if self._bound is not None:
+                self.buffer = collections.deque([value, *self.buffer])
+            return
+
+        while self._ready_receivers:
+            ready_receiver: Future[Any] = self._ready_receivers.popleft()
+            if not ready_receiver.cancelled():
+                ready_receiver.set_result(value)
+                return
+
+        if self._bound is None:
+            self._ready_producers.appendleft(ProducerComponent(None, value))
+            return
+
+        enqueue_times = self._adaptive.enqueue_times if self._adaptive is not None else None
+        if len(self.buffer) >= self._bound:
+            # keep the bound, the newest item waits like a producer would
+            self._ready_producers.appendleft(ProducerComponent(None, self.buffer.pop()))
+            if enqueue_times is not None:
+                enqueue_times.pop()
+        self.buffer.appendleft(value)
+        if self._adaptive is not None:
+            self._adaptive.enqueued(len(self.buffer), front=True)
+        if self._high_watermark is not None:
+            self._check_watermarks()
+
     def close(self) -> None:
         """
         Closes the channel.
@@ -228,24 +478,36 @@ class Channel:
 
         In-flight receivers in a unbuffered channels are terminated as well but for a buffered channel, the buffer is
         drained , giving waiting receivers avaible items. All leftover receivers after that are terminated with are
-        `ChannelClosed` exception.
+        `ChannelClosed` exception. Values put back into a full buffer by cancelled receivers are kept with the
+        buffered items, an unbuffered channel has nowhere to keep them and drops them.
 
         """
 
         # close channel
         self._closed = True
+        if self._drain_waiters is not None:
+            self._notify_drained()
+
+        # values put back behind a full buffer are kept with the buffered items
+        if self._bound:
+            requeued = [p.value for p in self._ready_producers if p.producer is None]
+            if requeued:
+                self.buffer = collections.deque([*self.buffer, *requeued])
 
         # tell all waiting producers channel is closed
         for p in self._ready_producers:
-            waiting_producer: Future[Any] = p.producer
-            waiting_producer.set_exception(ChannelClosed(which_chan=self))
+            p.fail(ChannelClosed(which_chan=self))
+        self._ready_producers.clear()
 
         waiting_recievers_to_satisfy: list[Any] = []
         # for buffered channels drain the buffer for all waiting receivers
         if self._bound:
             while self.buffer and self._ready_receivers:
+                waiting_receiver: Future[Any] = self._ready_receivers.popleft()
+                if waiting_receiver.cancelled():
+                    continue
                 waiting_recievers_to_satisfy.append(
-                    (self._ready_receivers.popleft(), self.buffer.popleft())
+                    (waiting_receiver, self.buffer.popleft())
                 )
             leftover_receivers = collections.deque(self._ready_receivers)
             self._ready_receivers.clear()
@@ -256,12 +518,113 @@ class Channel:
 
             # give left over recievers exceptions
             for receiver in leftover_receivers:
-                receiver.set_exception(ChannelClosed(which_chan=self))
+                if not receiver.done():
+                    receiver.set_exception(ChannelClosed(which_chan=self))
+
+            if self._high_watermark is not None:
+                self._check_watermarks()
             return
 
         # for unbuffered channels , no draining -- just give exceptions
         for r in self._ready_receivers:
-            r.set_exception(ChannelClosed(which_chan=self))
+            if not r.done():
+                r.set_exception(ChannelClosed(which_chan=self))
+        self._ready_receivers.clear()
+
+    async def drained(self, close: bool = False) -> None:
+        """
+        Waits until every item pushed into the channel so far has been pulled out of it,
+        including items of producers waiting for space. Returns immediately if the channel is closed.
+
+        :param close:   stop accepting items right away, producers waiting for space are terminated with a
+                        `ChannelClosed` exception, and close the channel once the buffered items have been pulled.
+                        Unlike `close`, no buffered item is lost.
+        """
+        if self._closed:
+            return
+        if close:
+            self._draining = True
+            for p in self._ready_producers:
+                p.fail(ChannelClosed(which_chan=self))
+            # values put back by `_requeue` are still waiting to be pulled
+            self._ready_producers = collections.deque(
+                p for p in self._ready_producers if p.producer is None
+            )
+        if self._is_drained():
+            if close:
+                self.close()
+            return
+        waiter: Future[Any] = asyncio.Future()
+        if self._drain_waiters is None:
+            self._drain_waiters = []
+        self._drain_waiters.append(waiter)
+        await waiter
+
+    def _is_drained(self) -> bool:
+        if self._bound is not None and self.buffer:
+            return False
+        return all(p.producer is not None and p.producer.done() for p in self._ready_producers)
+
+    def _notify_drained(self) -> None:
+        if not self._closed and not self._is_drained():
+            return
+        drain_waiters: list[Future[Any]] = self._drain_waiters  # pyright: ignore[reportAssignmentType]
+        self._drain_waiters = None
+        if self._draining and not self._closed:
+            self.close()
+        for waiter in drain_waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+
+    def _adapt(self) -> None:
+        adaptive: AdaptiveBound = self._adaptive  # pyright: ignore[reportAssignmentType]
+        new_bound = adaptive.dequeued(self._bound, len(self.buffer))  # pyright: ignore[reportArgumentType]
+        if new_bound is None:
+            return
+
+        self._bound = new_bound
+        self.buffer = collections.deque(self.buffer, maxlen=new_bound)
+
+        # a grown buffer has room for producers that were waiting
+        while self._ready_producers and len(self.buffer) < new_bound:
+            producer_component: ProducerComponent = self._ready_producers.popleft()
+            if producer_component.wake():
+                self.buffer.append(producer_component.value)
+                adaptive.enqueued(len(self.buffer))
+
+    def _check_watermarks(self) -> None:
+        size = len(self.buffer)
+        if not self._above_high_watermark:
+            if size >= self._high_watermark:  # pyright: ignore[reportOperatorIssue]
+                self._above_high_watermark = True
+                self._low_watermark_event.clear()
+                self._high_watermark_event.set()
+                if self._on_high_watermark is not None:
+                    self._on_high_watermark()
+        elif size <= self._low_watermark:  # pyright: ignore[reportOperatorIssue]
+            self._above_high_watermark = False
+            self._high_watermark_event.clear()
+            self._low_watermark_event.set()
+            if self._on_low_watermark is not None:
+                self._on_low_watermark()
+
+    async def wait_high_watermark(self) -> None:
+        """
+        Waits until the buffer has risen to the high watermark.
+        Returns immediately if the channel is currently above its high watermark.
+        """
+        if self._high_watermark is None:
+            raise ChannelError("Channel has no watermarks configured")
+        await self._high_watermark_event.wait()
+
+    async def wait_low_watermark(self) -> None:
+        """
+        Waits until the buffer has fallen back to the low watermark.
+        Returns immediately if the channel is currently not above its high watermark.
+        """
+        if self._high_watermark is None:
+            raise ChannelError("Channel has no watermarks configured")
+        await self._low_watermark_event.wait()
 
     # async iteration
     def __aiter__(self):
@@ -299,11 +662,21 @@ class Channel:
     def closed(self) -> bool:
         return self._closed
 
+    @property
+    def bound(self) -> int | None:
+        """The current bound of the channel, None for unbuffered channels."""
+        return self._bound
+
+    @property
+    def above_high_watermark(self) -> bool:
+        """True from the moment the high watermark is reached until the buffer falls back to the low watermark."""
+        return self._above_high_watermark
+
 
 # -----------------------------------------------------------------
 async def chanselect(
-    *ops: tuple[Channel, Coroutine[None, None, Any]]
-) -> tuple[Channel, Any | None]:
+    *ops: tuple[Any, Coroutine[None, None, Any]]
+) -> tuple[Any, Any | None]:
     """
     Provides a way to wait on multiple channel operations at once and returns the one that finishes first.
     Accepts the channel and its operatios as a tupe
@@ -316,25 +689,66 @@ async def chanselect(
 
     If the operation is a `pull` it returns the channel and the value  ->  (chan,value).
     If the operation is a `push` it returns the channel and the None  ->  (chan,None).
+
+    When several operations complete at once the first one in argument order wins. Values pulled by
+    the other operations, or by all of them when `chanselect` itself is cancelled, are put back at the
+    front of their channel. This covers the pull operations of every channel type, including
+    `pull_many`, passed directly and not wrapped in another coroutine.
     """
 
+    # how each operation gives back a value it pulled, before the coroutines start running
+    put_backs = [_put_back_for(chan, coro) for chan, coro in ops]
+
     # turn coroutines into tasks using helper wrapper
     tasks = [asyncio.create_task(_wrap(op[1], op[0])) for op in ops]
 
-    done, pending = await asyncio.wait(
-        tasks, return_when=asyncio.FIRST_COMPLETED
-    )  # returns which ever task finishes first
+    try:
+        done, _ = await asyncio.wait(
+            tasks, return_when=asyncio.FIRST_COMPLETED
+        )  # returns which ever task finishes first
 
-    winner = done.pop()
-    value, chan = await winner
+        winner = next(t for t in tasks if t in done)
 
-    # cancel the rest
-    for p in pending:
-        p.cancel()
+        # cancel the rest
+        await _cancel_losers(tasks, put_backs, winner)
+    except asyncio.CancelledError:
+        # nothing is returned, give back whatever was pulled on our behalf, the winner's value included
+        await _cancel_losers(tasks, put_backs, None)
+        raise
 
+    value, chan = winner.result()
     return chan, value
 
 
-async def _wrap(coro: Coroutine[None, None, Any], chan: Channel):
+def _put_back_for(
+    chan: Any, coro: Coroutine[None, None, Any]
+) -> Callable[[Any], None] | None:
+    # every channel type knows which of its operations pull and how to give their values back
+    put_back_for = getattr(chan, "_put_back_for", None)
+    return put_back_for(coro) if put_back_for is not None else None
+
+
+async def _cancel_losers(
+    tasks: list[asyncio.Task[Any]],
+    put_backs: list[Callable[[Any], None] | None],
+    winner: asyncio.Task[Any] | None,
+) -> None:
+    losers = [t for t in tasks if t is not winner]
+    for t in losers:
+        t.cancel()
+    if losers:
+        # let cancelled pulls hand back values they were given but had not resumed with yet
+        await asyncio.wait(losers)
+
+    # each value goes back to the front, so the last one pulled goes back first to keep the order
+    for t, put_back in reversed(list(zip(tasks, put_backs))):
+        if t is winner or put_back is None or t.cancelled() or t.exception() is not None:
+            continue
+        # completed before it could be cancelled, a pulled value goes back to its channel
+        value, _ = t.result()
+        put_back(value)
+
+
+async def _wrap(coro: Coroutine[None, None, Any], chan: Any):
     val = await coro
     return val, chan
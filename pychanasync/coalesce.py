@@ -0,0 +1,262 @@
+import asyncio
+from asyncio import Future
+from collections import deque
+from typing import Any, Callable, Coroutine, Hashable
+
+from pychanasync.chan import ProducerComponent
+from pychanasync.errors import ChannelError, ChannelClosed, ChannelFull, ChannelEmpty
+
+
+class KeyedProducerComponent(ProducerComponent):
+    def __init__(self, producer: Future[Any] | None, key: Hashable, value: Any):
+        super().__init__(producer, value)
+        self.key = key
+
+
+class CoalescingChannel:
+    """
+    A buffered channel where only the latest value per key is kept.
+
+    Pushing a value for a key which is already pending in the buffer overwrites the pending
+    value in place, the entry keeps its position in the queue. Consumers therefore only ever
+    see the freshest value for a key and the work they do is bounded by the number of distinct
+    keys and not by the rate of updates.
+
+    :param bound:   The maximum number of distinct pending keys in the buffer.
+                    Producers pushing a new key only block when this many keys are pending.
+                    Producers pushing a key that is already pending never block, and blocked
+                    producers whose key becomes pending coalesce into it and return right away.
+
+    """
+
+    def __init__(self, bound: int) -> None:
+
+        # validate bound
+        if bound < 1:
+            raise ChannelError("CoalescingChannel bound must be > 0")
+
+        self._bound: int = bound
+        # dicts preserve insertion order and overwriting a key keeps its position
+        self.buffer: dict[Hashable, Any] = {}
+        self._closed: bool = False
+        self._ready_receivers: deque[Future[Any]] = deque()
+        self._ready_producers: deque[KeyedProducerComponent] = deque()
+
+    def __repr__(self) -> str:
+        return f"<CoalescingChan 0x{id(self):X}>"
+
+    def _hand_to_receiver(self, key: Hashable, value: Any) -> bool:
+        # give the entry to the first receiver still waiting, skipping cancelled ones
+        while self._ready_receivers:
+            ready_receiver: Future[Any] = self._ready_receivers.popleft()
+            if not ready_receiver.cancelled():
+                ready_receiver.set_result((key, value))
+                return True
+        return False
+
+    def _put(self, key: Hashable, value: Any) -> bool:
+        # coalesce into a pending entry or append while there is space
+        if key in self.buffer or len(self.buffer) < self._bound:
+            self.buffer[key] = value
+            return True
+        return False
+
+    def _take(self) -> tuple[Hashable, Any]:
+        key = next(iter(self.buffer))
+        item = self.buffer.pop(key)
+
+        # a slot was freed, promote producers still waiting until it is filled
+        while self._ready_producers and len(self.buffer) < self._bound:
+            producer_component: KeyedProducerComponent = self._ready_producers.popleft()
+            if producer_component.wake():
+                self.buffer[producer_component.key] = producer_component.value
+                self._merge_waiting(producer_component.key)
+        return key, item
+
+    def _merge_waiting(self, key: Hashable) -> None:
+        # producers blocked on a key that just became pending coalesce into it and return
+        waiting: deque[KeyedProducerComponent] = deque()
+        for producer_component in self._ready_producers:
+            if producer_component.key != key:
+                waiting.append(producer_component)
+            elif producer_component.wake():
+                self.buffer[key] = producer_component.value
+        self._ready_producers = waiting
+
+    async def push(self, key: Hashable, value: Any) -> Future[Any] | None:
+        """
+        pushes a value for `key` into the channel
+
+        if `key` is already pending, its value is replaced in place and `push` returns immediately.
+        if `key` is not pending, `push` will put it at the back of the channel and return immediately
+        if there is space in the buffer. otherwise it will block and wait until there is space.
+
+        :param key: the key the value belongs to
+        :param value: the item to push into the channel
+
+        """
+
+        if self._closed:
+            raise ChannelClosed(which_chan=self)
+
+        if self._hand_to_receiver(key, value):
+            return
+
+        if self._put(key, value):
+            return
+
+        # if there is no space in the buffer producer will wait
+        ready_producer: Future[Any] = asyncio.Future()
+        self._ready_producers.append(KeyedProducerComponent(ready_producer, key, value))
+        return await ready_producer
+
+    def push_nowait(self, key: Hashable, value: Any) -> None:
+        """
+        Pushes a value for `key` into the channel and does not wait or suspend if the channel is full.
+
+        `push_nowait` raises a `ChannelFull` exception when `key` is not pending and there are
+        already `bound` distinct keys in the buffer.
+
+        :param key: the key the value belongs to
+        :param value: the item to push into the channel
+        """
+
+        if self._closed:
+            raise ChannelClosed(which_chan=self)
+
+        if self._hand_to_receiver(key, value):
+            return
+
+        if self._put(key, value):
+            return
+
+        raise ChannelFull(which_chan=self)
+
+    async def pull(self) -> tuple[Hashable, Any]:
+        """
+        Pulls the oldest pending key and its freshest value from the channel as a `(key, value)` tuple.
+
+        `pull` returns immediately if the buffer is not empty. Otherwise it will block and wait
+        until there is an item in the channel.
+
+        """
+        if self._closed:
+            raise ChannelClosed(which_chan=self)
+
+        if self.buffer:
+            return self._take()
+
+        ready_receiver: Future[Any] = asyncio.Future()
+        self._ready_receivers.append(ready_receiver)
+        try:
+            return await ready_receiver
+        except asyncio.CancelledError:
+            # handed an entry but cancelled before it could resume, the entry goes back
+            if ready_receiver.done() and not ready_receiver.cancelled():
+                if ready_receiver.exception() is None:
+                    self._requeue(ready_receiver.result())
+            raise
+
+    def pull_nowait(self) -> tuple[Hashable, Any]:
+        """
+        Pulls the oldest pending key and its freshest value from the channel and does not wait or
+        suspend when the channel is empty. Raises a `ChannelEmpty` exception instead.
+
+        """
+        if self._closed:
+            raise ChannelClosed(which_chan=self)
+
+        if self.buffer:
+            return self._take()
+
+        raise ChannelEmpty(which_chan=self)
+
+    def _put_back_for(self, coro: Coroutine[None, None, Any]) -> Callable[[Any], None] | None:
+        # how `chanselect` gives back an entry returned by `coro` once it lost, None if it is not a pull
+        if getattr(coro, "cr_code", None) is CoalescingChannel.pull.__code__:
+            return self._requeue
+        return None
+
+    def _requeue(self, item: tuple[Hashable, Any]) -> None:
+        # a pulled entry nobody took goes back to the front of the channel
+        key, value = item
+        if not self._closed and self._hand_to_receiver(key, value):
+            return
+        if key in self.buffer:
+            # a fresher value for the key is already pending, it wins
+            return
+
+        if not self._closed and len(self.buffer) >= self._bound:
+            # keep the bound, the newest entry waits like a producer would
+            last = next(reversed(self.buffer))
+            self._ready_producers.appendleft(
+                KeyedProducerComponent(None, last, self.buffer.pop(last))
+            )
+        self.buffer = {key: value, **self.buffer}
+        # producers blocked on the key hold fresher values, they coalesce into it and return
+        self._merge_waiting(key)
+
+    def close(self) -> None:
+        """
+        Closes the channel.
+
+        All in flight producers are terminated with a `ChannelClosed` exception.
+        The buffer is drained to waiting receivers, leftover receivers are terminated with a
+        `ChannelClosed` exception.
+
+        """
+
+        self._closed = True
+
+        for p in self._ready_producers:
+            if p.producer is None:
+                # put back behind a full buffer, kept with the pending entries
+                self.buffer.setdefault(p.key, p.value)
+            else:
+                p.fail(ChannelClosed(which_chan=self))
+        self._ready_producers.clear()
+
+        while self.buffer and self._ready_receivers:
+            receiver: Future[Any] = self._ready_receivers.popleft()
+            if receiver.cancelled():
+                continue
+            key = next(iter(self.buffer))
+            receiver.set_result((key, self.buffer.pop(key)))
+
+        for r in self._ready_receivers:
+            if not r.done():
+                r.set_exception(ChannelClosed(which_chan=self))
+        self._ready_receivers.clear()
+
+    # async iteration
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> tuple[Hashable, Any]:
+        try:
+            return await self.pull()
+        except ChannelClosed:
+            raise StopAsyncIteration
+
+    # Context manager
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def empty(self) -> bool:
+        """Returns True if there are no pending keys, False otherwise."""
+        return len(self.buffer) == 0
+
+    def full(self) -> bool:
+        """Returns True if there are `bound` distinct keys pending in the channel."""
+        return len(self.buffer) == self._bound
+
+    def csize(self) -> int:
+        """Return the number of distinct pending keys in the channel."""
+        return len(self.buffer)
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
@@ -38,3 +38,14 @@ class ChannelEmpty(Exception):
     def __init__(self, *args: object, **kwargs: object) -> None:
         self.which_chan: object = kwargs.pop("which_chan")
         super().__init__(*args, **kwargs)
+
+
+class ChannelRateLimited(Exception):
+    """
+    ChannelRateLimited  exception  thrown when a rate limited channel has no tokens left, and
+    the caller does not want to wait.
+    """
+
+    def __init__(self, *args: object, **kwargs: object) -> None:
+        self.which_chan: object = kwargs.pop("which_chan")
+        super().__init__(*args, **kwargs)
@@ -0,0 +1,171 @@
+import asyncio
+from asyncio import Task
+from typing import Any, Coroutine, Iterable
+
+from pychanasync.chan import Channel
+from pychanasync.errors import ChannelClosed
+
+
+class ChannelGroup:
+    """
+    Owns the channels of a pipeline and the tasks attached to them, similar to Go's errgroup.
+
+    Channels are registered in topological order, i.e from the source of the pipeline to its sink,
+    either by creating them with `channel` or by registering existing ones with `add`.
+    Tasks are started with `go`, optionally declaring which channels they read from and write to.
+    The first task to fail with anything other than `ChannelClosed` shuts the whole group down,
+    its exception is raised from `wait`.
+
+    Example: async with ChannelGroup() as group:
+        raw = group.channel(bound=100)
+        parsed = group.channel(bound=100)
+        group.go(read(raw), writes=raw)
+        group.go(parse(raw, parsed), reads=raw, writes=parsed)
+        group.go(store(parsed), reads=parsed)
+
+    """
+
+    def __init__(self) -> None:
+        self._channels: list[Channel] = []
+        # in creation order, so a failure nobody has recorded yet is found deterministically
+        self._tasks: list[Task[Any]] = []
+        # tasks writing into a channel which themselves read from a group channel
+        self._stages: dict[Channel, list[Task[Any]]] = {}
+        self._error: BaseException | None = None
+        self._closed: bool = False
+
+    def __repr__(self) -> str:
+        return f"<ChannelGroup 0x{id(self):X}>"
+
+    def channel(self, bound: int | None = None, **kwargs: Any) -> Channel:
+        """
+        Creates a channel owned by the group. Accepts the same arguments as `Channel`.
+        """
+        return self.add(Channel(bound, **kwargs))
+
+    def add(self, chan: Channel) -> Channel:
+        """
+        Registers an existing channel with the group, downstream of the channels already registered.
+        """
+        if self._closed:
+            raise ChannelClosed(which_chan=chan)
+        self._channels.append(chan)
+        return chan
+
+    def go(
+        self,
+        coro: Coroutine[Any, Any, Any],
+        *,
+        reads: Channel | Iterable[Channel] = (),
+        writes: Channel | Iterable[Channel] = (),
+    ) -> Task[Any]:
+        """
+        Runs `coro` as a task of the group.
+
+        Declaring the channels a stage `reads` from and `writes` to lets `shutdown` wait for the stage
+        to push what it still holds before its output channel is closed.
+        Raises `ChannelClosed` once the group is closed or shutting down, `coro` is then closed unstarted.
+
+        :param coro: the coroutine to run
+        :param reads: channel(s) the task pulls from
+        :param writes: channel(s) the task pushes into
+        """
+        if self._closed:
+            coro.close()
+            raise ChannelClosed(which_chan=self)
+
+        task = asyncio.create_task(coro)
+        self._tasks.append(task)
+        task.add_done_callback(self._on_task_done)
+
+        if isinstance(reads, Channel):
+            reads = (reads,)
+        if isinstance(writes, Channel):
+            writes = (writes,)
+        # sources read nothing and only stop once their output is closed, never wait for them
+        if any(True for _ in reads):
+            for chan in writes:
+                self._stages.setdefault(chan, []).append(task)
+        return task
+
+    @staticmethod
+    def _failure_of(task: Task[Any]) -> BaseException | None:
+        if task.cancelled():
+            return None
+        exc = task.exception()
+        # stages ending on a closed channel is how a pipeline shuts down
+        if exc is None or isinstance(exc, ChannelClosed):
+            return None
+        return exc
+
+    def _on_task_done(self, task: Task[Any]) -> None:
+        exc = self._failure_of(task)
+        if exc is not None and self._error is None:
+            self._error = exc
+            self.close()
+
+    def close(self) -> None:
+        """
+        Closes every channel of the group in topological order and cancels its tasks.
+
+        All channels are closed in a single synchronous pass, so no stage can run in between and
+        push into a downstream channel which is about to be closed. Every parked waiter is woken up.
+        """
+        self._closed = True
+        for chan in self._channels:
+            if not chan.closed:
+                chan.close()
+        for task in self._tasks:
+            task.cancel()
+
+    async def wait(self) -> None:
+        """
+        Waits for every task of the group and raises the first failure, if any.
+        """
+        while pending := [t for t in self._tasks if not t.done()]:
+            await asyncio.wait(pending)
+        if self._error is None:
+            # done callbacks run on a later loop iteration, a task may have failed unnoticed
+            for task in self._tasks:
+                if (exc := self._failure_of(task)) is not None:
+                    self._error = exc
+                    break
+        if self._error is not None:
+            raise self._error
+
+    async def shutdown(self, timeout: float | None = None) -> None:
+        """
+        Gracefully shuts the group down.
+
+        Going from source to sink, each channel is closed once the stages writing into it have finished
+        and the items buffered in it have been pulled by the stage downstream, so nothing in flight is lost.
+        Stages are expected to finish once their input channel is closed. If that does not happen within
+        `timeout` seconds the remaining channels are closed at once and the tasks are cancelled.
+
+        :param timeout: seconds allowed for draining, None to wait forever
+        """
+        self._closed = True
+        try:
+            async with asyncio.timeout(timeout):
+                for chan in self._channels:
+                    # upstream is closed by now, wait for stages to flush what they hold into chan
+                    if stages := self._stages.get(chan):
+                        await asyncio.wait(stages)
+                    await chan.drained(close=True)
+                await self.wait()
+        except TimeoutError:
+            self.close()
+            await self.wait()
+
+    # Context manager
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        if exc is not None:
+            self.close()
+        await self.wait()
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
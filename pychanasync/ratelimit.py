@@ -0,0 +1,260 @@
+import asyncio
+import collections
+from asyncio import Future, TimerHandle
+from typing import Any, Callable, Coroutine, Literal
+
+from pychanasync.chan import Channel
+from pychanasync.errors import (
+    ChannelError,
+    ChannelClosed,
+    ChannelEmpty,
+    ChannelRateLimited,
+)
+
+
+class TokenBucket:
+    """
+    A token bucket holding up to `burst` tokens, refilled at `rate` tokens per second.
+
+    Waiters are served in FIFO order by a single timer which is armed for the moment the
+    first waiter can be satisfied. Every refill releases as many waiters as there are tokens for.
+
+    :param rate:    tokens added per second.
+    :param burst:   the capacity of the bucket, i.e the largest burst let through at once.
+    """
+
+    def __init__(self, rate: float, burst: int = 1) -> None:
+        if rate <= 0:
+            raise ChannelError("TokenBucket rate must be > 0")
+        if burst < 1:
+            raise ChannelError("TokenBucket burst must be > 0")
+
+        self._rate = rate
+        self._burst = burst
+        self._tokens: float = burst
+        self._last: float | None = None
+        self._waiters: collections.deque[tuple[int, Future[Any]]] = collections.deque()
+        self._handle: TimerHandle | None = None
+
+    def _refill(self, now: float) -> None:
+        if self._last is not None:
+            self._tokens = min(self._burst, self._tokens + (now - self._last) * self._rate)
+        self._last = now
+
+    def try_acquire(self, n: int = 1) -> bool:
+        """Takes `n` tokens if they are available right now, without queueing behind waiters."""
+        self._refill(asyncio.get_running_loop().time())
+        if not self._waiters and self._tokens >= n:
+            self._tokens -= n
+            return True
+        return False
+
+    async def acquire(self, n: int = 1) -> None:
+        """
+        Takes `n` tokens, waiting until they are available.
+
+        :param n: number of tokens to take, at most `burst`
+        """
+        if n < 1:
+            raise ChannelError("Cannot acquire fewer than one token")
+        if n > self._burst:
+            raise ChannelError("Cannot acquire more tokens than the bucket burst")
+        if self.try_acquire(n):
+            return
+
+        waiter: Future[Any] = asyncio.get_running_loop().create_future()
+        self._waiters.append((n, waiter))
+        if self._handle is None:
+            self._arm()
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.cancelled():
+                # give up our place so the waiters behind us are not held up until our timer fires
+                if (n, waiter) in self._waiters:
+                    self._waiters.remove((n, waiter))
+                self._wake()
+            elif waiter.done():
+                # cancelled after the tokens were handed over, give them back
+                self.release(n)
+            raise
+
+    def release(self, n: int = 1) -> None:
+        """Gives back `n` unused tokens."""
+        self._tokens = min(self._burst, self._tokens + n)
+        if self._waiters:
+            self._wake()
+
+    def _arm(self) -> None:
+        loop = asyncio.get_running_loop()
+        n, _ = self._waiters[0]
+        delay = max(0.0, (n - self._tokens) / self._rate)
+        self._handle = loop.call_at(loop.time() + delay, self._wake)
+
+    def _wake(self) -> None:
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        self._refill(asyncio.get_running_loop().time())
+
+        while self._waiters:
+            n, waiter = self._waiters[0]
+            if waiter.done():  # cancelled waiters give up their place
+                self._waiters.popleft()
+                continue
+            if self._tokens < n:
+                break
+            self._waiters.popleft()
+            self._tokens -= n
+            waiter.set_result(None)
+
+        if self._waiters:
+            self._arm()
+
+    def fail(self, exc: BaseException) -> None:
+        """Terminates all waiters with `exc`."""
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        for _, waiter in self._waiters:
+            if not waiter.done():
+                waiter.set_exception(exc)
+        self._waiters.clear()
+
+
+class RateLimitedChannel(Channel):
+    """
+    A channel whose `pull` (or `push`) operations are throttled by a token bucket.
+
+    Each item pulled (or pushed) takes one token, tokens are refilled at `rate` per second up to `burst`.
+    Waiting on tokens does not wake the event loop per item, waiters are released by a single timer.
+
+    :param bound:   the channel bound, as for `Channel`.
+    :param rate:    items per second let through.
+    :param burst:   the number of items let through at once after an idle period.
+    :param limit:   which side of the channel is throttled, "pull" (default) or "push".
+
+    """
+
+    def __init__(
+        self,
+        bound: int | None = None,
+        *,
+        rate: float,
+        burst: int = 1,
+        limit: Literal["pull", "push"] = "pull",
+    ) -> None:
+        if limit not in ("pull", "push"):
+            raise ChannelError('RateLimitedChannel limit must be "pull" or "push"')
+
+        super().__init__(bound=bound)
+        self._bucket = TokenBucket(rate, burst)
+        self._limit_pull = limit == "pull"
+
+    def __repr__(self) -> str:
+        return f"<RateLimitedChan 0x{id(self):X}>"
+
+    async def _acquire(self, n: int = 1) -> None:
+        if self._closed:
+            raise ChannelClosed(which_chan=self)
+        await self._bucket.acquire(n)
+
+    async def push(self, value: Any) -> Future[Any] | None:
+        if self._limit_pull:
+            return await super().push(value)
+        await self._acquire()
+        try:
+            return await super().push(value)
+        except BaseException:
+            self._bucket.release()
+            raise
+
+    def push_nowait(self, value: Any) -> Future[Any] | None:
+        if self._limit_pull:
+            return super().push_nowait(value)
+        if self._closed:
+            raise ChannelClosed(which_chan=self)
+        if not self._bucket.try_acquire():
+            raise ChannelRateLimited(which_chan=self)
+        try:
+            return super().push_nowait(value)
+        except Exception:
+            self._bucket.release()
+            raise
+
+    async def pull(self) -> None | Any:
+        if not self._limit_pull:
+            return await super().pull()
+        await self._acquire()
+        try:
+            return await super().pull()
+        except BaseException:
+            self._bucket.release()
+            raise
+
+    def pull_nowait(self) -> None | Any:
+        if not self._limit_pull:
+            return super().pull_nowait()
+        if self._closed:
+            raise ChannelClosed(which_chan=self)
+        if not self._bucket.try_acquire():
+            raise ChannelRateLimited(which_chan=self)
+        try:
+            return super().pull_nowait()
+        except ChannelEmpty:
+            self._bucket.release()
+            raise
+
+    async def pull_many(self, n: int) -> list[Any]:
+        """
+        Pulls up to `n` items, taking `n` tokens in one step.
+
+        Waits for the tokens and for at least one item, then takes whatever else is already
+        buffered up to `n` items. Tokens for items that were not available are given back.
+        Only allowed when pulls are throttled.
+
+        :param n: the maximum number of items to pull, at most `burst`
+        """
+        if not self._limit_pull:
+            raise ChannelError("pull_many is only allowed when pulls are rate limited")
+        if n < 1:
+            raise ChannelError("pull_many needs n > 0")
+
+        await self._acquire(n)
+        try:
+            items = [await super().pull()]
+        except BaseException:
+            self._bucket.release(n)
+            raise
+        if self._bound is not None:
+            while len(items) < n and self.buffer:
+                items.append(super().pull_nowait())
+        if len(items) < n:
+            self._bucket.release(n - len(items))
+        return items
+
+    def _put_back_for(self, coro: Coroutine[None, None, Any]) -> Callable[[Any], None] | None:
+        code = getattr(coro, "cr_code", None)
+        if code is RateLimitedChannel.pull.__code__:
+            return self._put_back
+        if code is RateLimitedChannel.pull_many.__code__:
+            return self._put_back_many
+        return None
+
+    def _put_back(self, value: Any) -> None:
+        # the item was not consumed after all, neither is the token it took
+        self._requeue(value)
+        if self._limit_pull:
+            self._bucket.release()
+
+    def _put_back_many(self, items: list[Any]) -> None:
+        for value in reversed(items):
+            self._requeue(value)
+        self._bucket.release(len(items))
+
+    def close(self) -> None:
+        """
+        Closes the channel, tasks waiting for tokens are terminated with a `ChannelClosed` exception.
+        """
+        super().close()
+        self._bucket.fail(ChannelClosed(which_chan=self))
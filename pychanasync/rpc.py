@@ -0,0 +1,156 @@
+import asyncio
+from asyncio import Future
+from typing import Any, Awaitable, Callable, cast
+
+from pychanasync.chan import Channel
+from pychanasync.errors import ChannelError, ChannelClosed
+
+
+class Envelope:
+    """
+    A request travelling through a `Service` together with the future its caller is waiting on.
+    The server answers in place with `reply` or `fail` instead of pushing into a reply channel.
+    """
+
+    __slots__ = ("request", "_future")
+
+    def __init__(self, request: Any, future: Future[Any]):
+        self.request = request
+        self._future = future
+
+    def reply(self, value: Any) -> None:
+        """Resolves the call with `value`. Does nothing if the caller has already given up."""
+        if not self._future.done():
+            self._future.set_result(value)
+
+    def fail(self, exc: BaseException) -> None:
+        """Makes the call raise `exc`. Does nothing if the caller has already given up."""
+        if not self._future.done():
+            self._future.set_exception(exc)
+
+    def cancelled(self) -> bool:
+        """Returns True if the caller cancelled or timed out, the request need not be handled."""
+        return self._future.cancelled()
+
+
+class Service:
+    """
+    A request/reply primitive built on a `Channel`.
+
+    Callers `await svc.call(request)` and get the reply back, the server side pulls `Envelope`s
+    with `receive` (or `async for`) and answers them with `reply`/`fail`. Each call costs one
+    envelope and one future, no reply channel is allocated.
+
+    When a caller is cancelled or times out its future is cancelled, servers skip such requests
+    if they have not started on them yet and can check `envelope.cancelled()` while working.
+
+    :param bound:   The buffer size of the underlying channel. None for an unbuffered channel where
+                    callers wait until a server picks up their request.
+
+    :param max_in_flight:   Upper bound on the number of calls that are queued or being served at once.
+                            Further callers wait for a slot. None means unlimited.
+
+    """
+
+    def __init__(self, bound: int | None = None, max_in_flight: int | None = None) -> None:
+
+        if max_in_flight is not None and max_in_flight < 1:
+            raise ChannelError("Service max_in_flight must be > 0")
+
+        self._chan = Channel(bound=bound)
+        self._in_flight: asyncio.Semaphore | None = (
+            asyncio.Semaphore(max_in_flight) if max_in_flight is not None else None
+        )
+
+    def __repr__(self) -> str:
+        return f"<Service 0x{id(self):X}>"
+
+    async def call(self, request: Any, timeout: float | None = None) -> Any:
+        """
+        Sends `request` to the service and waits for its reply.
+
+        Raises `TimeoutError` if no reply arrives within `timeout` seconds, time spent waiting
+        for an in-flight slot or buffer space counts towards it. Raises `ChannelClosed` if the
+        service is closed before the request is answered, and `ChannelError` if the server
+        handling it is cancelled.
+
+        :param request: the request to send
+        :param timeout: seconds to wait for the reply, None to wait forever
+        """
+        async with asyncio.timeout(timeout):
+            if self._in_flight is None:
+                return await self._call(request)
+            async with self._in_flight:
+                return await self._call(request)
+
+    async def _call(self, request: Any) -> Any:
+        future: Future[Any] = asyncio.get_running_loop().create_future()
+        await self._chan.push(Envelope(request, future))
+        try:
+            return await future
+        finally:
+            # propagate cancellation to the server side
+            future.cancel()
+
+    async def receive(self) -> Envelope:
+        """
+        Waits for the next request whose caller is still waiting.
+
+        Raises `ChannelClosed` once the service is closed.
+        """
+        while True:
+            envelope = cast(Envelope, await self._chan.pull())
+            if not envelope.cancelled():
+                return envelope
+
+    async def serve(self, handler: Callable[[Any], Awaitable[Any]]) -> None:
+        """
+        Answers requests one at a time with `handler` until the service is closed.
+        Exceptions raised by `handler` are passed on to the caller. If the server is cancelled
+        while handling a request, its caller gets a `ChannelError` instead of waiting forever.
+
+        :param handler: coroutine function called with each request, its result is the reply
+        """
+        async for envelope in self:
+            try:
+                envelope.reply(await handler(envelope.request))
+            except Exception as exc:
+                envelope.fail(exc)
+            except BaseException:
+                envelope.fail(ChannelError("Service stopped before answering the request"))
+                raise
+
+    def close(self) -> None:
+        """
+        Closes the service.
+
+        Waiting callers, including those whose request is still buffered, are terminated with a
+        `ChannelClosed` exception. Requests already received by a server can still be answered.
+        """
+        chan = self._chan
+        chan.close()
+        if chan.csize():
+            for envelope in chan.buffer:
+                envelope.fail(ChannelClosed(which_chan=self))
+            chan.buffer.clear()
+
+    # async iteration
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> Envelope:
+        try:
+            return await self.receive()
+        except ChannelClosed:
+            raise StopAsyncIteration
+
+    # Context manager
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    @property
+    def closed(self) -> bool:
+        return self._chan.closed
@@ -0,0 +1,251 @@
+import asyncio
+import math
+import weakref
+from asyncio import AbstractEventLoop, TimerHandle
+from typing import Any, Callable
+
+from pychanasync.chan import Channel
+from pychanasync.errors import ChannelError
+
+WHEEL_BITS = 6
+WHEEL_SLOTS = 1 << WHEEL_BITS
+WHEEL_MASK = WHEEL_SLOTS - 1
+WHEEL_LEVELS = 4
+RESOLUTION = 0.001  # seconds per tick of the innermost wheel
+
+
+class _Timer:
+    def __init__(self, expires: int, callback: Callable[[], Any]):
+        self.expires = expires
+        self.callback = callback
+        self.cancelled = False
+
+
+class _TimerWheel:
+    """
+    A hierarchical timing wheel shared by every timer channel of an event loop.
+
+    Timers are hashed into `WHEEL_LEVELS` wheels of `WHEEL_SLOTS` slots. The innermost wheel has a
+    slot per tick, each outer wheel has a slot per full turn of the wheel inside it. Timers are
+    moved (cascaded) inwards as their deadline comes closer and are fired from the innermost wheel.
+    The whole wheel is driven by a single `loop.call_at` handle instead of a task per timer.
+    """
+
+    def __init__(self, loop: AbstractEventLoop, resolution: float = RESOLUTION) -> None:
+        self._resolution = resolution
+        self._origin = loop.time()
+        self._current = 0  # last tick processed
+        self._wheels: list[list[list[_Timer]]] = [
+            [[] for _ in range(WHEEL_SLOTS)] for _ in range(WHEEL_LEVELS)
+        ]
+        self._count = 0  # live (not cancelled, not fired) timers
+        self._handle: TimerHandle | None = None
+        self._armed_tick: int | None = None
+
+    def _tick_of(self, when: float) -> int:
+        return math.floor((when - self._origin) / self._resolution)
+
+    def schedule(self, when: float, callback: Callable[[], Any]) -> _Timer:
+        """Calls `callback` once the loop time reaches `when`, rounded up to the next tick."""
+        loop = asyncio.get_running_loop()
+        if self._count == 0:
+            # nothing to cascade, just catch up with the clock
+            self._current = max(self._current, self._tick_of(loop.time()))
+
+        expires = math.ceil((when - self._origin) / self._resolution)
+        timer = _Timer(max(expires, self._current + 1), callback)
+        self._insert(timer)
+        self._count += 1
+        self._arm(loop)
+        return timer
+
+    def cancel(self, timer: _Timer) -> None:
+        # lazy removal, the slot is cleaned up when the wheel reaches it
+        if not timer.cancelled:
+            timer.cancelled = True
+            self._count -= 1
+            if self._count == 0 and self._handle is not None:
+                self._handle.cancel()
+                self._handle = None
+                self._armed_tick = None
+
+    def _insert(self, timer: _Timer) -> None:
+        delta = timer.expires - self._current
+        for level in range(WHEEL_LEVELS):
+            if delta < 1 << (WHEEL_BITS * (level + 1)):
+                slot = (timer.expires >> (WHEEL_BITS * level)) & WHEEL_MASK
+                self._wheels[level][slot].append(timer)
+                return
+
+        # beyond the outermost wheel, park it in the furthest slot and reinsert on cascade
+        top = WHEEL_LEVELS - 1
+        furthest = self._current + (1 << (WHEEL_BITS * WHEEL_LEVELS)) - 1
+        self._wheels[top][(furthest >> (WHEEL_BITS * top)) & WHEEL_MASK].append(timer)
+
+    def _next_tick(self) -> int | None:
+        # the earliest tick at which a non-empty slot of any wheel is due to fire or cascade,
+        # empty slots are skipped so an idle wheel does not wake up on every inner turn
+        next_tick: int | None = None
+        for level in range(WHEEL_LEVELS):
+            shift = WHEEL_BITS * level
+            # slots of this wheel hold the positions after the current one, up to a full turn ahead
+            position = self._current >> shift
+            wheel = self._wheels[level]
+            for step in range(1, WHEEL_SLOTS + 1):
+                if wheel[(position + step) & WHEEL_MASK]:
+                    tick = (position + step) << shift
+                    if next_tick is None or tick < next_tick:
+                        next_tick = tick
+                    break
+            # outer wheels cannot hold anything due before the next turn of this one
+            outer = shift + WHEEL_BITS
+            if next_tick is not None and next_tick <= ((self._current >> outer) + 1) << outer:
+                break
+        return next_tick
+
+    def _arm(self, loop: AbstractEventLoop) -> None:
+        if self._count == 0:
+            return
+        tick = self._next_tick()
+        if tick is None:
+            return
+        if self._armed_tick is not None and self._armed_tick <= tick:
+            return
+        if self._handle is not None:
+            self._handle.cancel()
+        self._armed_tick = tick
+        self._handle = loop.call_at(self._origin + tick * self._resolution, self._run)
+
+    def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        self._handle = None
+        self._armed_tick = None
+
+        target = self._tick_of(loop.time())
+        while self._current < target and self._count:
+            tick = self._next_tick()
+            if tick is None or tick > target:
+                break
+            self._current = tick
+            self._cascade(tick)
+            self._fire(tick)
+        self._current = max(self._current, target)
+
+        self._arm(loop)
+
+    def _cascade(self, tick: int) -> None:
+        for level in range(1, WHEEL_LEVELS):
+            if tick & ((1 << (WHEEL_BITS * level)) - 1):
+                break
+            slot = (tick >> (WHEEL_BITS * level)) & WHEEL_MASK
+            timers = self._wheels[level][slot]
+            self._wheels[level][slot] = []
+            for timer in timers:
+                if not timer.cancelled:
+                    self._insert(timer)
+
+    def _fire(self, tick: int) -> None:
+        slot = tick & WHEEL_MASK
+        timers = self._wheels[0][slot]
+        self._wheels[0][slot] = []
+        for timer in timers:
+            if timer.cancelled:
+                continue
+            timer.cancelled = True
+            self._count -= 1
+            timer.callback()
+
+
+_wheels: "weakref.WeakKeyDictionary[AbstractEventLoop, _TimerWheel]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _get_wheel() -> _TimerWheel:
+    loop = asyncio.get_running_loop()
+    wheel = _wheels.get(loop)
+    if wheel is None:
+        wheel = _wheels[loop] = _TimerWheel(loop)
+    return wheel
+
+
+class _TimerChannel(Channel):
+    """
+    A buffered channel of size one fed by the shared timer wheel.
+    Sends once after `delay` seconds, or every `interval` seconds when one is given.
+    Closing the channel cancels its pending timer.
+    """
+
+    def __init__(self, wheel: _TimerWheel, delay: float, interval: float | None = None) -> None:
+        super().__init__(bound=1)
+        self._wheel = wheel
+        self._interval = interval
+        self._loop = asyncio.get_running_loop()
+        self._deadline = self._loop.time() + delay
+        self._timer: _Timer | None = wheel.schedule(
+            self._deadline, self._fire_once if interval is None else self._tick
+        )
+
+    def __repr__(self) -> str:
+        return f"<TimerChan 0x{id(self):X}>"
+
+    def _send(self, now: float) -> None:
+        # like Go, drop the value rather than pile up when the consumer is slow
+        if not self._closed and not self.full():
+            self.push_nowait(now)
+
+    def _fire_once(self) -> None:
+        self._timer = None
+        self._send(self._loop.time())
+
+    def _tick(self) -> None:
+        interval: float = self._interval  # pyright: ignore[reportAssignmentType]
+        now = self._loop.time()
+        self._send(now)
+        if self._closed:
+            return
+        # keep the original cadence, skipping deadlines already missed
+        self._deadline += interval
+        if self._deadline <= now:
+            self._deadline += math.ceil((now - self._deadline) / interval) * interval
+            if self._deadline <= now:
+                self._deadline += interval
+        self._timer = self._wheel.schedule(self._deadline, self._tick)
+
+    def close(self) -> None:
+        if self._timer is not None:
+            self._wheel.cancel(self._timer)
+            self._timer = None
+        super().close()
+
+
+def after(delay: float) -> Channel:
+    """
+    Returns a channel which receives the loop time once, after `delay` seconds.
+    Similar to Go's `time.After`, it composes with `chanselect` for timeouts.
+
+    Example: chan, value = await chanselect(
+        (results, results.pull()),
+        (timeout, timeout.pull()),
+    )
+
+    :param delay: seconds to wait before the value is sent
+    """
+    if delay < 0:
+        raise ChannelError("after delay must be >= 0")
+
+    return _TimerChannel(_get_wheel(), delay)
+
+
+def ticker(interval: float) -> Channel:
+    """
+    Returns a channel which receives the loop time every `interval` seconds.
+    Similar to Go's `time.Tick`, ticks are dropped when the consumer falls behind
+    and the ticker stops once the channel is closed.
+
+    :param interval: seconds between ticks
+    """
+    if interval <= 0:
+        raise ChannelError("ticker interval must be > 0")
+
+    return _TimerChannel(_get_wheel(), interval, interval)
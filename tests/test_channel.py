@@ -1,8 +1,9 @@
 import asyncio
+import gc
 import pytest
 from typing import Any
 from pychanasync import chanselect, Channel
-from pychanasync.errors import ChannelEmpty, ChannelError, ChannelFull
+from pychanasync.errors import ChannelClosed, ChannelEmpty, ChannelError, ChannelFull
 
 
 class YieldToTheEventLoop:
@@ -245,3 +246,173 @@ class TestChannel:
 
         assert chan.full() is False
         assert chan.csize() == 0
+
+    async def test_watermark_callbacks_fire_with_hysteresis(self):
+        events: list[str] = []
+        chan = Channel(
+            bound=10,
+            high_watermark=4,
+            low_watermark=1,
+            on_high_watermark=lambda: events.append("high"),
+            on_low_watermark=lambda: events.append("low"),
+        )
+
+        for i in range(4):
+            chan.push_nowait(i)
+        assert events == ["high"]
+        assert chan.above_high_watermark is True
+
+        chan.pull_nowait()
+        chan.pull_nowait()
+        chan.push_nowait(4)  # back around the high watermark, no new callback
+        assert events == ["high"]
+
+        while len(chan.buffer) > 1:
+            chan.pull_nowait()
+        assert events == ["high", "low"]
+        assert chan.above_high_watermark is False
+
+    async def test_watermark_events_can_be_awaited(self):
+        chan = Channel(bound=4, high_watermark=2)
+
+        waiter = asyncio.create_task(chan.wait_high_watermark())
+        await asyncio.sleep(0)
+        assert waiter.done() is False
+
+        await chan.push(1)
+        await chan.push(2)
+        await asyncio.wait_for(waiter, 1)
+
+        await chan.pull()
+        await asyncio.wait_for(chan.wait_low_watermark(), 1)
+
+    async def test_watermarks_on_unbuffered_channel_should_raise_a_channelException(
+        self,
+    ):
+        with pytest.raises(ChannelError):
+            Channel(high_watermark=2)
+
+        with pytest.raises(ChannelError):
+            Channel(bound=2, high_watermark=3)
+
+    async def test_adaptive_bound_grows_when_producers_block_often(self):
+        chan = Channel(bound=2, max_bound=64)
+        container: list[Any] = []
+
+        async def slow_consumer():
+            while (value := await chan.pull()) is not None:
+                container.append(value)
+                await YieldToTheEventLoop()
+
+        consumer = asyncio.create_task(slow_consumer())
+        for i in range(500):
+            await chan.push(i)
+        await chan.push(None)
+        await consumer
+
+        assert chan.bound is not None and chan.bound > 2
+        assert container == list(range(500))
+
+    async def test_adaptive_bound_shrinks_when_occupancy_stays_low(self):
+        chan = Channel(bound=64, min_bound=4, max_bound=64)
+
+        for i in range(200):
+            chan.push_nowait(i)
+            assert chan.pull_nowait() == i
+
+        assert chan.bound == 4
+
+    async def test_adaptive_bound_shrinks_when_queueing_delay_exceeds_target(self):
+        chan = Channel(bound=64, max_bound=64, target_latency=0.001)
+        for i in range(40):
+            chan.push_nowait(i)
+
+        await asyncio.sleep(0.01)
+        values = [chan.pull_nowait() for _ in range(32)]
+
+        assert values == list(range(32))
+        assert chan.bound is not None and chan.bound < 64
+        assert chan.csize() == 8
+
+    async def test_adaptive_bound_ignores_idle_time_between_bursts(self):
+        chan = Channel(bound=32, min_bound=1, max_bound=64, target_latency=0.005)
+
+        for _ in range(3):
+            for i in range(32):
+                chan.push_nowait(i)
+            assert [chan.pull_nowait() for _ in range(32)] == list(range(32))
+            await asyncio.sleep(0.05)
+
+        # items never waited, the idle gaps must not be mistaken for a slow consumer
+        assert chan.bound == 32
+
+    async def test_invalid_adaptive_bounds_should_raise_a_channelException(self):
+        with pytest.raises(ChannelError):
+            Channel(max_bound=10)
+
+        with pytest.raises(ChannelError):
+            Channel(bound=20, max_bound=10)
+
+        with pytest.raises(ChannelError):
+            Channel(bound=5, target_latency=0.005)
+
+    async def test_drained_with_close_keeps_buffered_items_and_refuses_new_ones(self):
+        chan = Channel(bound=3)
+        for i in range(3):
+            await chan.push(i)
+        blocked = asyncio.create_task(chan.push(3))
+        await YieldToTheEventLoop()
+
+        draining = asyncio.create_task(chan.drained(close=True))
+        await YieldToTheEventLoop()
+
+        with pytest.raises(ChannelClosed):
+            await blocked
+        with pytest.raises(ChannelClosed):
+            chan.push_nowait(4)
+
+        assert [await chan.pull() for _ in range(3)] == [0, 1, 2]
+        await draining
+        assert chan.closed is True
+
+    async def test_chanselect_puts_back_several_pulls_on_one_channel_in_order(self):
+        other = Channel(bound=1)
+        other.push_nowait("x")
+        chan = Channel(bound=4)
+        for value in "abcd":
+            chan.push_nowait(value)
+
+        ch, _ = await chanselect(
+            (other, other.pull()), (chan, chan.pull()), (chan, chan.pull())
+        )
+
+        assert ch is other
+        assert list(chan.buffer) == ["a", "b", "c", "d"]
+
+    async def test_close_after_a_value_was_put_back_fails_no_placeholder(self):
+        loop = asyncio.get_running_loop()
+        errors: list[Any] = []
+        loop.set_exception_handler(lambda _, context: errors.append(context))
+
+        unbuffered = Channel()
+        buffered = Channel(bound=1)
+        for chan in (unbuffered, buffered):
+            receiver = asyncio.create_task(chan.pull())
+            await YieldToTheEventLoop()
+            asyncio.create_task(chan.push("a"))
+            await YieldToTheEventLoop()
+            if chan is buffered:
+                chan.push_nowait("b")
+            # handed "a" but cancelled before resuming, "a" is put back
+            receiver.cancel()
+            await asyncio.wait([receiver])
+
+        unbuffered.close()
+        buffered.close()
+        gc.collect()
+        await YieldToTheEventLoop()
+        loop.set_exception_handler(None)
+
+        assert errors == []
+        # put back behind a full buffer, kept with the buffered items
+        assert list(buffered.buffer) == ["a", "b"]
@@ -0,0 +1,168 @@
+import asyncio
+import pytest
+from typing import Any
+from pychanasync import Channel, CoalescingChannel, chanselect
+from pychanasync.errors import ChannelClosed, ChannelEmpty, ChannelError, ChannelFull
+
+
+class TestCoalescingChannel:
+    async def test_newer_value_replaces_pending_value_and_keeps_position(self):
+        chan = CoalescingChannel(bound=3)
+
+        await chan.push("a", 1)
+        await chan.push("b", 1)
+        await chan.push("a", 2)
+        await chan.push("c", 1)
+        await chan.push("b", 2)
+
+        assert chan.csize() == 3
+        assert await chan.pull() == ("a", 2)
+        assert await chan.pull() == ("b", 2)
+        assert await chan.pull() == ("c", 1)
+        assert chan.empty() is True
+
+    async def test_pushing_a_pending_key_never_blocks_when_full(self):
+        chan = CoalescingChannel(bound=2)
+        chan.push_nowait("a", 1)
+        chan.push_nowait("b", 1)
+
+        assert chan.full() is True
+        chan.push_nowait("a", 2)
+
+        with pytest.raises(ChannelFull):
+            chan.push_nowait("c", 1)
+
+        assert chan.pull_nowait() == ("a", 2)
+
+    async def test_blocked_producer_is_promoted_when_a_key_is_pulled(self):
+        chan = CoalescingChannel(bound=1)
+        await chan.push("a", 1)
+
+        producer = asyncio.create_task(chan.push("b", 1))
+        await asyncio.sleep(0)
+        assert producer.done() is False
+
+        assert await chan.pull() == ("a", 1)
+        await producer
+        assert chan.pull_nowait() == ("b", 1)
+
+    async def test_waiting_receiver_gets_value_directly(self):
+        chan = CoalescingChannel(bound=1)
+        receiver = asyncio.create_task(chan.pull())
+        await asyncio.sleep(0)
+
+        await chan.push("a", 1)
+
+        assert await receiver == ("a", 1)
+        assert chan.empty() is True
+
+    async def test_cancelled_receiver_does_not_swallow_value(self):
+        chan = CoalescingChannel(bound=1)
+        cancelled = asyncio.create_task(chan.pull())
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        await asyncio.sleep(0)
+
+        await chan.push("a", 1)
+
+        assert chan.pull_nowait() == ("a", 1)
+
+    async def test_close_drains_buffer_to_waiting_receivers_and_stops_iteration(self):
+        chan = CoalescingChannel(bound=4)
+        container: list[Any] = []
+
+        async def consume():
+            async for item in chan:
+                container.append(item)
+
+        consumer = asyncio.create_task(consume())
+        for i in range(10):
+            await chan.push(i % 2, i)
+        await asyncio.sleep(0)
+        chan.close()
+        await consumer
+
+        assert container[-1] in ((0, 8), (1, 9))
+        with pytest.raises(ChannelClosed):
+            await chan.push("a", 1)
+
+    async def test_composes_with_chanselect(self):
+        chan = CoalescingChannel(bound=2)
+        chan.push_nowait("a", 1)
+
+        ch, value = await chanselect((chan, chan.pull()))
+
+        assert ch is chan
+        assert value == ("a", 1)
+
+    async def test_chanselect_puts_back_entries_pulled_by_losers(self):
+        other = Channel(bound=1)
+        other.push_nowait("x")
+        chan = CoalescingChannel(bound=2)
+        chan.push_nowait("a", 1)
+
+        ch, value = await chanselect((other, other.pull()), (chan, chan.pull()))
+
+        assert ch is other and value == "x"
+        assert chan.csize() == 1
+        assert chan.pull_nowait() == ("a", 1)
+
+    async def test_put_back_entry_takes_the_value_of_a_producer_blocked_on_its_key(self):
+        chan = CoalescingChannel(bound=2)
+        receiver = asyncio.create_task(chan.pull())
+        await asyncio.sleep(0)
+
+        # runs before the receiver resumes and blocks on the full buffer
+        blocked = asyncio.create_task(chan.push("k", 2))
+        chan.push_nowait("k", 1)  # handed to the receiver
+        chan.push_nowait("z", 1)
+        chan.push_nowait("w", 1)
+        receiver.cancel()
+        await asyncio.wait([receiver])
+
+        assert [chan.pull_nowait() for _ in range(3)] == [("k", 2), ("z", 1), ("w", 1)]
+        await asyncio.wait_for(blocked, 1)  # returned once its value was merged
+
+    async def test_cancelled_pull_puts_back_the_entry_it_was_handed(self):
+        chan = CoalescingChannel(bound=1)
+        receiver = asyncio.create_task(chan.pull())
+        await asyncio.sleep(0)
+
+        chan.push_nowait("a", 1)
+        chan.push_nowait("b", 1)  # fills the buffer
+        receiver.cancel()
+        await asyncio.wait([receiver])
+
+        assert chan.pull_nowait() == ("a", 1)
+        assert chan.pull_nowait() == ("b", 1)
+
+    async def test_pull_nowait_on_empty_channel_raises_channelEmpty(self):
+        chan = CoalescingChannel(bound=2)
+        with pytest.raises(ChannelEmpty):
+            chan.pull_nowait()
+
+    async def test_invalid_bound_raises_channelError(self):
+        with pytest.raises(ChannelError):
+            CoalescingChannel(bound=0)
+
+    async def test_promoted_producers_merge_and_fill_the_freed_slot(self):
+        chan = CoalescingChannel(bound=2)
+        chan.push_nowait("a", 1)
+        chan.push_nowait("b", 1)
+
+        producers = [
+            asyncio.create_task(chan.push("k", 1)),
+            asyncio.create_task(chan.push("k", 2)),
+            asyncio.create_task(chan.push("z", 1)),
+        ]
+        await asyncio.sleep(0)
+
+        assert chan.pull_nowait() == ("a", 1)
+        # both producers of "k" are done, the second merged into the first
+        assert chan.buffer == {"b": 1, "k": 2}
+        assert chan.pull_nowait() == ("b", 1)
+        assert chan.buffer == {"k": 2, "z": 1}
+
+        await asyncio.gather(*producers)
+        with pytest.raises(ChannelFull):
+            chan.push_nowait("new", 1)
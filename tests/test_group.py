@@ -0,0 +1,110 @@
+import asyncio
+import pytest
+from typing import Any
+from pychanasync import Channel, ChannelGroup, ChannelClosed
+
+
+async def source(out: Channel):
+    i = 0
+    while True:
+        await out.push(i)
+        i += 1
+
+
+async def double(inp: Channel, out: Channel):
+    async for value in inp:
+        await out.push(value * 2)
+
+
+async def sink(inp: Channel, container: list[Any]):
+    async for value in inp:
+        container.append(value)
+        await asyncio.sleep(0)
+
+
+class TestChannelGroup:
+    async def test_shutdown_drains_buffered_items_downstream(self):
+        group = ChannelGroup()
+        raw = group.channel(bound=10)
+        doubled = group.channel(bound=10)
+        container: list[Any] = []
+
+        group.go(source(raw), writes=raw)
+        group.go(double(raw, doubled), reads=raw, writes=doubled)
+        group.go(sink(doubled, container), reads=doubled)
+        await asyncio.sleep(0.01)
+
+        await group.shutdown(timeout=1)
+
+        assert raw.closed and doubled.closed
+        assert container == [i * 2 for i in range(len(container))]
+        # every item that made it into the pipeline reached the sink
+        assert raw.csize() == 0 and doubled.csize() == 0
+
+    async def test_first_failure_closes_the_group_and_is_raised(self):
+        group = ChannelGroup()
+        chan = group.channel()
+
+        async def failing():
+            raise ValueError("boom")
+
+        waiter = group.go(chan.pull())
+        group.go(failing())
+
+        with pytest.raises(ValueError):
+            await group.wait()
+
+        assert chan.closed is True
+        assert waiter.done() is True
+        assert group.closed is True
+
+    async def test_shutdown_closes_everything_when_timeout_expires(self):
+        group = ChannelGroup()
+        stuck = group.channel(bound=1)
+        stuck.push_nowait("never pulled")
+        blocked = group.go(stuck.push("blocked"))
+
+        await group.shutdown(timeout=0.01)
+
+        assert stuck.closed is True
+        assert blocked.done() is True
+
+    async def test_context_manager_waits_for_tasks(self):
+        container: list[Any] = []
+
+        async with ChannelGroup() as group:
+            chan = group.channel(bound=5)
+
+            async def produce():
+                for i in range(5):
+                    await chan.push(i)
+                await chan.drained(close=True)
+
+            producer = group.go(produce())
+            consumer = group.go(sink(chan, container))
+
+        assert producer.done() and consumer.done()
+        assert chan.closed is True
+        assert container == list(range(5))
+
+    async def test_stage_failure_is_raised_when_the_body_fails_too(self):
+        async def failing():
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError):
+            async with ChannelGroup() as group:
+                group.go(failing())
+                await asyncio.sleep(0)
+                raise KeyError("body")
+
+    async def test_go_on_a_closed_group_raises(self):
+        group = ChannelGroup()
+        group.close()
+
+        async def never():
+            pass
+
+        coro = never()
+        with pytest.raises(ChannelClosed):
+            group.go(coro)
+        assert coro.cr_frame is None  # closed, no never awaited warning
@@ -0,0 +1,170 @@
+import asyncio
+import pytest
+from pychanasync import chanselect, Channel, RateLimitedChannel
+from pychanasync.errors import ChannelClosed, ChannelError, ChannelRateLimited
+
+
+class TestRateLimitedChannel:
+    async def test_burst_passes_then_pulls_are_paced_by_the_rate(self):
+        loop = asyncio.get_running_loop()
+        chan = RateLimitedChannel(bound=10, rate=100, burst=3)
+        for i in range(5):
+            chan.push_nowait(i)
+
+        start = loop.time()
+        assert [await chan.pull() for _ in range(3)] == [0, 1, 2]
+        assert loop.time() - start < 0.01
+
+        assert [await chan.pull() for _ in range(2)] == [3, 4]
+        assert loop.time() - start >= 0.019
+
+    async def test_pull_nowait_raises_when_out_of_tokens(self):
+        chan = RateLimitedChannel(bound=4, rate=1, burst=1)
+        chan.push_nowait(1)
+        chan.push_nowait(2)
+
+        assert chan.pull_nowait() == 1
+        with pytest.raises(ChannelRateLimited):
+            chan.pull_nowait()
+
+    async def test_push_side_limiting(self):
+        chan = RateLimitedChannel(bound=4, rate=1, burst=2, limit="push")
+        chan.push_nowait(1)
+        chan.push_nowait(2)
+
+        with pytest.raises(ChannelRateLimited):
+            chan.push_nowait(3)
+        assert chan.pull_nowait() == 1
+
+    async def test_pull_many_takes_tokens_in_one_step_and_refunds_unused(self):
+        chan = RateLimitedChannel(bound=10, rate=1, burst=5)
+        for i in range(3):
+            chan.push_nowait(i)
+
+        assert await chan.pull_many(5) == [0, 1, 2]
+
+        chan.push_nowait(3)
+        chan.push_nowait(4)
+        assert await chan.pull_many(2) == [3, 4]
+
+        with pytest.raises(ChannelError):
+            await chan.pull_many(6)
+
+    async def test_waiters_are_released_in_order_as_tokens_refill(self):
+        chan = RateLimitedChannel(bound=10, rate=50, burst=3)
+        for i in range(6):
+            chan.push_nowait(i)
+        assert await chan.pull_many(3) == [0, 1, 2]
+
+        waiters = [asyncio.create_task(chan.pull()) for _ in range(3)]
+        await asyncio.sleep(0.07)
+
+        assert all(w.done() for w in waiters)
+        assert [w.result() for w in waiters] == [3, 4, 5]
+
+    async def test_returned_tokens_release_several_waiters_at_once(self):
+        chan = RateLimitedChannel(bound=10, rate=0.1, burst=3)
+        # holds every token while it waits for an item
+        holder = asyncio.create_task(chan.pull_many(3))
+        await asyncio.sleep(0)
+
+        waiters = [asyncio.create_task(chan.pull()) for _ in range(3)]
+        await asyncio.sleep(0)
+        holder.cancel()
+        await asyncio.wait([holder])
+        await asyncio.sleep(0)
+        for i in range(3):
+            chan.push_nowait(i)
+        await asyncio.sleep(0)
+
+        assert [w.result() for w in waiters] == [0, 1, 2]
+
+    async def test_waiter_cancelled_before_its_tokens_does_not_hold_up_the_queue(self):
+        loop = asyncio.get_running_loop()
+        chan = RateLimitedChannel(bound=10, rate=10, burst=5)
+        for i in range(6):
+            chan.push_nowait(i)
+        assert await chan.pull_many(5) == [0, 1, 2, 3, 4]
+
+        cancelled = asyncio.create_task(chan.pull_many(5))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        await asyncio.wait([cancelled])
+
+        start = loop.time()
+        assert await chan.pull() == 5
+        assert loop.time() - start < 0.2
+
+    async def test_invalid_token_counts_raise_channelError(self):
+        chan = RateLimitedChannel(bound=2, rate=1, burst=2)
+        chan.push_nowait(1)
+
+        for n in (0, -5):
+            with pytest.raises(ChannelError):
+                await chan.pull_many(n)
+        assert chan.pull_nowait() == 1
+
+    async def test_cancelled_pull_gives_its_token_back(self):
+        chan = RateLimitedChannel(bound=2, rate=0.1, burst=1)
+
+        waiter = asyncio.create_task(chan.pull())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        await asyncio.wait([waiter])
+
+        chan.push_nowait(1)
+        assert chan.pull_nowait() == 1
+
+    async def test_chanselect_loser_gives_its_token_back(self):
+        limited = RateLimitedChannel(bound=2, rate=0.1, burst=1)
+        other = Channel(bound=2)
+        other.push_nowait("a")
+
+        chan, _ = await chanselect((limited, limited.pull()), (other, other.pull()))
+
+        assert chan is other
+        limited.push_nowait("b")
+        assert limited.pull_nowait() == "b"
+
+    async def test_chanselect_puts_back_items_and_tokens_of_completed_losers(self):
+        limited = RateLimitedChannel(bound=4, rate=0.1, burst=2)
+        other = Channel(bound=2)
+        for value in ("a", "b"):
+            limited.push_nowait(value)
+            other.push_nowait(value)
+
+        chan, _ = await chanselect((other, other.pull()), (limited, limited.pull()))
+        assert chan is other
+        chan, _ = await chanselect((other, other.pull()), (limited, limited.pull_many(2)))
+        assert chan is other
+
+        assert limited.pull_nowait() == "a"
+        assert limited.pull_nowait() == "b"
+
+    async def test_close_wakes_tasks_waiting_for_tokens(self):
+        chan = RateLimitedChannel(bound=2, rate=0.1, burst=1)
+        chan.push_nowait(1)
+        chan.push_nowait(2)
+        await chan.pull()
+
+        waiter = asyncio.create_task(chan.pull())
+        await asyncio.sleep(0)
+        chan.close()
+
+        with pytest.raises(ChannelClosed):
+            await waiter
+
+    async def test_composes_with_chanselect(self):
+        limited = RateLimitedChannel(bound=2, rate=0.1, burst=1)
+        other = Channel(bound=2)
+        limited.push_nowait("a")
+        limited.push_nowait("b")
+        await limited.pull()
+
+        other.push_nowait("c")
+        chan, value = await chanselect(
+            (limited, limited.pull()), (other, other.pull())
+        )
+
+        assert chan is other
+        assert value == "c"
@@ -0,0 +1,90 @@
+import asyncio
+import pytest
+from typing import Any
+from pychanasync import Service
+from pychanasync.errors import ChannelClosed, ChannelError
+
+
+async def double(request: Any) -> Any:
+    return request * 2
+
+
+class TestService:
+    async def test_calls_are_answered_by_the_server(self):
+        svc = Service(bound=4)
+        server = asyncio.create_task(svc.serve(double))
+
+        replies = await asyncio.gather(*(svc.call(i) for i in range(20)))
+
+        assert replies == [i * 2 for i in range(20)]
+        svc.close()
+        await server
+
+    async def test_handler_exceptions_are_raised_in_the_caller(self):
+        svc = Service()
+
+        async def failing(request: Any) -> Any:
+            raise ValueError(request)
+
+        server = asyncio.create_task(svc.serve(failing))
+
+        with pytest.raises(ValueError):
+            await svc.call("boom")
+
+        svc.close()
+        await server
+
+    async def test_cancelled_server_fails_the_request_it_was_handling(self):
+        svc = Service()
+        started = asyncio.Event()
+
+        async def stuck(request: Any) -> Any:
+            started.set()
+            await asyncio.Event().wait()
+
+        server = asyncio.create_task(svc.serve(stuck))
+        caller = asyncio.create_task(svc.call("x"))
+        await started.wait()
+        server.cancel()
+
+        with pytest.raises(ChannelError):
+            await asyncio.wait_for(caller, 1)
+        svc.close()
+
+    async def test_timed_out_call_is_cancelled_on_the_server_side(self):
+        svc = Service(bound=2)
+
+        with pytest.raises(TimeoutError):
+            await svc.call("slow", timeout=0.01)
+
+        # the abandoned request is skipped, the next live one is received
+        caller = asyncio.create_task(svc.call("live"))
+        envelope = await svc.receive()
+        assert envelope.request == "live"
+        envelope.reply("ok")
+        assert await caller == "ok"
+
+    async def test_in_flight_calls_are_bounded(self):
+        svc = Service(bound=10, max_in_flight=2)
+        callers = [asyncio.create_task(svc.call(i)) for i in range(5)]
+        await asyncio.sleep(0.01)
+
+        assert svc._chan.csize() == 2  # pyright: ignore[reportPrivateUsage]
+
+        async with svc:
+            for _ in range(5):
+                envelope = await svc.receive()
+                envelope.reply(envelope.request)
+
+        assert await asyncio.gather(*callers) == list(range(5))
+
+    async def test_close_fails_callers_whose_request_is_still_buffered(self):
+        svc = Service(bound=2)
+        caller = asyncio.create_task(svc.call("pending"))
+        await asyncio.sleep(0)
+
+        svc.close()
+
+        with pytest.raises(ChannelClosed):
+            await caller
+        assert svc.closed is True
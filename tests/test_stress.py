@@ -0,0 +1,225 @@
+"""
+Seeded stress harness for channel correctness under load.
+
+Every scenario is driven by a `random.Random(seed)`, no wall clock is involved, so a failing seed
+replays the exact same interleaving. Run as a script to print throughput and memory scaling curves:
+
+    python -m tests.test_stress
+"""
+
+import asyncio
+import collections
+import random
+import time
+import tracemalloc
+from typing import Any
+
+import pytest
+
+from pychanasync import chanselect, Channel
+from tests.test_channel import YieldToTheEventLoop
+
+
+class Scenario:
+    def __init__(
+        self,
+        seed: int,
+        bound: int | None,
+        producers: int,
+        items: int,
+        consumers: int = 1,
+        cancel_rate: float = 0.0,
+        select_rate: float = 0.0,
+    ):
+        self.seed = seed
+        self.bound = bound
+        self.producers = producers
+        self.items = items
+        self.consumers = consumers
+        self.cancel_rate = cancel_rate
+        self.select_rate = select_rate
+
+    def __repr__(self) -> str:
+        return (
+            f"Scenario(seed={self.seed}, bound={self.bound}, producers={self.producers}, "
+            f"items={self.items}, consumers={self.consumers}, cancel_rate={self.cancel_rate}, "
+            f"select_rate={self.select_rate})"
+        )
+
+
+async def run_scenario(scenario: Scenario) -> list[tuple[int, int]]:
+    """
+    Runs `scenario` and returns the `(producer, sequence)` items in the order they were received.
+
+    Producers push their own increasing sequence numbers. Consumers pull directly or through
+    `chanselect` against a channel nobody pushes into, and a chaos task cancels random consumers
+    mid-operation, replacing each once its cancellation has completed.
+    """
+    rng = random.Random(scenario.seed)
+    chan = Channel(bound=scenario.bound)
+    idle = Channel(bound=scenario.bound)
+    received: list[tuple[int, int]] = []
+    total = scenario.producers * scenario.items
+
+    async def produce(pid: int):
+        for seq in range(scenario.items):
+            await chan.push((pid, seq))
+            if rng.random() < 0.3:
+                await YieldToTheEventLoop()
+
+    async def consume():
+        while True:
+            if rng.random() < scenario.select_rate:
+                _, value = await chanselect((chan, chan.pull()), (idle, idle.pull()))
+            else:
+                value = await chan.pull()
+            assert value is not None
+            received.append(value)
+            if rng.random() < 0.3:
+                await YieldToTheEventLoop()
+
+    consumers = [asyncio.create_task(consume()) for _ in range(scenario.consumers)]
+    producers = [asyncio.create_task(produce(p)) for p in range(scenario.producers)]
+
+    # a lost item would keep us waiting forever, give up after a generous number of steps
+    for _ in range(total * 100):
+        if len(received) >= total:
+            break
+        await YieldToTheEventLoop()
+        if rng.random() < scenario.cancel_rate:
+            i = rng.randrange(len(consumers))
+            consumers[i].cancel()
+            await asyncio.wait([consumers[i]])
+            consumers[i] = asyncio.create_task(consume())
+
+    for task in producers + consumers:
+        task.cancel()
+    await asyncio.wait(producers + consumers)
+    chan.close()
+    idle.close()
+    return received
+
+
+def check_exactly_once(scenario: Scenario, received: list[tuple[int, int]]) -> None:
+    expected = {(p, s) for p in range(scenario.producers) for s in range(scenario.items)}
+    counts = collections.Counter(received)
+    duplicated = [item for item, n in counts.items() if n > 1]
+    assert not duplicated, f"{scenario}: delivered more than once {duplicated[:5]}"
+    assert set(counts) == expected, f"{scenario}: lost {sorted(expected - set(counts))[:5]}"
+
+
+def check_in_order(scenario: Scenario, received: list[tuple[int, int]]) -> None:
+    last: dict[int, int] = {}
+    for pid, seq in received:
+        assert last.get(pid, -1) < seq, f"{scenario}: producer {pid} out of order at {seq}"
+        last[pid] = seq
+
+
+SEEDS = range(10)
+
+
+class TestStress:
+    @pytest.mark.parametrize("seed", SEEDS)
+    @pytest.mark.parametrize("bound", [None, 1, 16])
+    async def test_many_producers_and_consumers_deliver_exactly_once(self, seed, bound):
+        scenario = Scenario(seed, bound, producers=200, items=10, consumers=20)
+        check_exactly_once(scenario, await run_scenario(scenario))
+
+    @pytest.mark.parametrize("seed", range(3))
+    @pytest.mark.parametrize("bound", [None, 16])
+    async def test_thousands_of_producers_deliver_exactly_once(self, seed, bound):
+        scenario = Scenario(
+            seed, bound, producers=2000, items=5, consumers=50, cancel_rate=0.05, select_rate=0.2
+        )
+        check_exactly_once(scenario, await run_scenario(scenario))
+
+    @pytest.mark.parametrize("seed", SEEDS)
+    @pytest.mark.parametrize("bound", [None, 1, 16])
+    async def test_cancelled_consumers_lose_nothing(self, seed, bound):
+        scenario = Scenario(
+            seed, bound, producers=50, items=20, consumers=10, cancel_rate=0.2
+        )
+        check_exactly_once(scenario, await run_scenario(scenario))
+
+    @pytest.mark.parametrize("seed", SEEDS)
+    @pytest.mark.parametrize("bound", [None, 1, 16])
+    async def test_chanselect_losers_lose_nothing(self, seed, bound):
+        scenario = Scenario(
+            seed,
+            bound,
+            producers=50,
+            items=20,
+            consumers=10,
+            cancel_rate=0.2,
+            select_rate=0.5,
+        )
+        check_exactly_once(scenario, await run_scenario(scenario))
+
+    @pytest.mark.parametrize("seed", SEEDS)
+    @pytest.mark.parametrize("bound", [None, 1, 16])
+    async def test_single_consumer_receives_in_order_despite_cancellations(
+        self, seed, bound
+    ):
+        scenario = Scenario(
+            seed, bound, producers=20, items=50, cancel_rate=0.2, select_rate=0.5
+        )
+        received = await run_scenario(scenario)
+        check_exactly_once(scenario, received)
+        check_in_order(scenario, received)
+
+    @pytest.mark.parametrize("seed", SEEDS)
+    async def test_close_while_draining_buffer_loses_nothing_handed_out(self, seed):
+        rng = random.Random(seed)
+        chan = Channel(bound=32)
+        received: list[Any] = []
+
+        async def consume():
+            async for value in chan:
+                received.append(value)
+                if rng.random() < 0.5:
+                    await YieldToTheEventLoop()
+
+        consumers = [asyncio.create_task(consume()) for _ in range(8)]
+        pushed = 0
+        for _ in range(rng.randrange(100, 1000)):
+            if chan.full():
+                await YieldToTheEventLoop()
+                continue
+            chan.push_nowait(pushed)
+            pushed += 1
+
+        await YieldToTheEventLoop()
+        chan.close()
+        await asyncio.gather(*consumers)
+
+        # items handed to waiting receivers by close are delivered once, the rest stay buffered
+        assert len(set(received)) == len(received)
+        assert len(received) + len(chan.buffer) == pushed
+
+
+async def measure(producers: int, items: int, bound: int | None) -> tuple[float, int]:
+    scenario = Scenario(
+        0, bound, producers=producers, items=items, consumers=producers // 10 or 1
+    )
+    tracemalloc.start()
+    start = time.perf_counter()
+    received = await run_scenario(scenario)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    check_exactly_once(scenario, received)
+    return len(received) / elapsed, peak
+
+
+async def main() -> None:
+    print(f"{'bound':>6} {'producers':>10} {'items/s':>12} {'peak KiB':>10}")
+    for bound in (None, 1, 64):
+        for producers in (10, 100, 1000, 5000):
+            throughput, peak = await measure(producers, 20, bound)
+            print(
+                f"{str(bound):>6} {producers:>10} {throughput:>12.0f} {peak / 1024:>10.1f}"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,100 @@
+import asyncio
+import random
+from typing import Any
+from pychanasync import chanselect, Channel, after, ticker
+from pychanasync.timer import _get_wheel, _TimerWheel  # pyright: ignore[reportPrivateUsage]
+
+
+class TestTimerChannels:
+    async def test_after_sends_a_single_value_once_delay_has_passed(self):
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        chan = after(0.02)
+
+        fired_at = await asyncio.wait_for(chan.pull(), 1)
+
+        assert fired_at is not None
+        assert fired_at - start >= 0.02
+        assert chan.empty() is True
+
+    async def test_after_composes_with_chanselect_as_a_timeout(self):
+        results = Channel()
+        timeout = after(0.01)
+
+        chan, _ = await chanselect(
+            (results, results.pull()), (timeout, timeout.pull())
+        )
+
+        assert chan is timeout
+
+    async def test_ticker_drops_ticks_for_slow_consumers(self):
+        chan = ticker(0.005)
+
+        await asyncio.sleep(0.05)
+        assert chan.csize() == 1  # never more than one pending tick
+
+        first = await chan.pull()
+        second = await asyncio.wait_for(chan.pull(), 1)
+        assert first is not None and second is not None
+        assert second > first
+        chan.close()
+
+    async def test_ticker_stops_when_its_channel_is_closed(self):
+        chan = ticker(0.005)
+        await asyncio.wait_for(chan.pull(), 1)
+
+        chan.close()
+        await asyncio.sleep(0.02)
+
+        # no timer left behind on the shared wheel, so it does not wake up any more
+        wheel = _get_wheel()
+        assert wheel._count == 0  # pyright: ignore[reportPrivateUsage]
+        assert wheel._handle is None  # pyright: ignore[reportPrivateUsage]
+
+    async def test_wheel_fires_many_timers_in_deadline_order(self):
+        loop = asyncio.get_running_loop()
+        wheel = _TimerWheel(loop, resolution=0.0001)
+        rng = random.Random(7)
+        fired: list[Any] = []
+        done = asyncio.Event()
+        delays = [rng.uniform(0, 0.5) for _ in range(2000)]
+        now = loop.time()
+
+        def on_fire(deadline: float):
+            fired.append((deadline, loop.time()))
+            if len(fired) == len(delays):
+                done.set()
+
+        timers = [wheel.schedule(now + d, lambda d=d: on_fire(now + d)) for d in delays]
+        for timer in timers[::10]:
+            wheel.cancel(timer)
+        expected = len(delays) - len(timers[::10])
+        delays = delays[:expected]  # so done is set on the last expected timer
+
+        await asyncio.wait_for(done.wait(), 5)
+
+        assert len(fired) == expected
+        assert all(fired_at >= deadline for deadline, fired_at in fired)
+        # timers sharing a tick may fire in any order, otherwise deadline order holds
+        deadlines = [deadline for deadline, _ in fired]
+        assert all(b > a - 0.0001 for a, b in zip(deadlines, deadlines[1:]))
+
+    async def test_wheel_only_wakes_up_for_slots_holding_timers(self):
+        loop = asyncio.get_running_loop()
+        wheel = _TimerWheel(loop)
+        runs = 0
+        run = wheel._run  # pyright: ignore[reportPrivateUsage]
+
+        def counting_run():
+            nonlocal runs
+            runs += 1
+            run()
+
+        wheel._run = counting_run  # pyright: ignore[reportPrivateUsage, reportAttributeAccessIssue]
+        fired = asyncio.Event()
+        wheel.schedule(loop.time() + 0.3, fired.set)
+
+        await asyncio.wait_for(fired.wait(), 1)
+
+        # one wakeup to cascade the outer slot and one to fire, not one per inner turn
+        assert runs <= 3